@@ -5,6 +5,9 @@ Provides comprehensive GDB debugging capabilities with session management
 """
 
 import asyncio
+import base64
+import functools
+import io
 import json
 import logging
 import os
@@ -15,11 +18,12 @@ import time
 import uuid
 import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
-import pexpect
+from typing import Dict, List, Optional, Any, Tuple, Union
 import psutil
 from fastmcp import FastMCP
 from fastmcp.tools import Tool
+from pygdbmi import gdbmiparser
+from pygdbmi.gdbescapes import unescape
 
 # Configure logging
 logging.basicConfig(
@@ -28,130 +32,272 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Server's working directory, used by sessions that don't ask for another one
+_DEFAULT_CWD = os.getcwd()
+
+# Records whose payload is plain text for the "output" field: MI stream records
+# (console, target and log) plus "output", pygdbmi's type for non-MI lines such
+# as the inferior's own prints and GDB's stderr
+STREAM_RECORD_TYPES = ("console", "target", "log", "output")
+STREAM_RECORD_PREFIXES = {"~": "console", "@": "target", "&": "log"}
+
+# Applied once at session start so commands never block on interactive prompts
+SESSION_SETTINGS = [
+    "-gdb-set pagination off",
+    "-gdb-set confirm off",
+    "-gdb-set height 0",
+    "-gdb-set print elements 0",
+]
+
+# Largest output, in characters, returned in one tool result; the rest is paged via gdb_read_output
+MAX_OUTPUT_CHARS = 1 << 20
+
+# Each GDB process can hold hundreds of MB, so cap how many clients may open
+MAX_SESSIONS = 32
+
+# Commands allowed to wait on a single session before new ones are rejected
+MAX_PENDING_COMMANDS = 64
+
+# Records parsed back to back before the reader yields to other tasks
+LINES_PER_YIELD = 1000
+
+# Line GDB prints once it is ready for the next command
+GDB_PROMPT = b"(gdb)"
+
+# StreamReader line limit; a single MI record (e.g. a huge print) can be long
+STREAM_LIMIT = 1 << 24
+
+# Seconds cleanup may take after SIGINT/SIGTERM before the process exits anyway
+SHUTDOWN_TIMEOUT = 15
+
+def _parse_record(text: str) -> Dict[str, Any]:
+    """Parse one line of MI output into a pygdbmi record dict.
+    
+    Stream records make up nearly all of a large output and only need their
+    C string unescaped, so they skip parse_response's cascade of regexes.
+    """
+    record_type = STREAM_RECORD_PREFIXES.get(text[0])
+    if record_type and len(text) >= 3 and text[1] == '"' and text[-1] == '"':
+        return {"type": record_type, "message": None, "payload": unescape(text[2:-1])}
+    
+    return gdbmiparser.parse_response(text)
+
+def _new_session_id() -> str:
+    """Random session id: a UUID4 as unpadded URL-safe base64 (22 chars)"""
+    return base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b"=").decode()
+
 class GDBSession:
     """Manages a single GDB debugging session"""
     
+    __slots__ = (
+        "session_id", "gdb_path", "working_dir", "process", "is_active",
+        "_lock", "_pending", "_token", "last_command", "last_output", "last_records"
+    )
+    
     def __init__(self, session_id: str, gdb_path: str = "gdb", working_dir: Optional[str] = None):
         self.session_id = session_id
         self.gdb_path = gdb_path
-        self.working_dir = working_dir or os.getcwd()
-        self.process: Optional[pexpect.spawn] = None
+        self.working_dir = working_dir or _DEFAULT_CWD
+        self.process: Optional[asyncio.subprocess.Process] = None
         self.is_active = False
-        self.command_queue = asyncio.Queue()
-        self.result_queue = asyncio.Queue()
-        self._processing_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._pending = 0
+        self._token = 0
+        self.last_command: Optional[str] = None
+        self.last_output = ""
+        self.last_records: List[Dict[str, Any]] = []
+        
+    def is_alive(self) -> bool:
+        """Check whether the GDB process is still running"""
+        return self.process is not None and self.process.returncode is None
+    
+    @property
+    def pid(self) -> Optional[int]:
+        """PID of the GDB process, if it is running"""
+        return self.process.pid if self.is_alive() else None
         
     async def start(self) -> Dict[str, Any]:
         """Start the GDB session"""
         try:
             # Start GDB with machine interface
-            cmd = [self.gdb_path, "--interpreter=mi3", "--quiet"]
-            
-            self.process = pexpect.spawn(
-                ' '.join(cmd),
+            self.process = await asyncio.create_subprocess_exec(
+                self.gdb_path, "--interpreter=mi3", "--quiet",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
                 cwd=self.working_dir,
-                encoding='utf-8',
-                timeout=30
+                limit=STREAM_LIMIT
             )
             
             # Wait for GDB to start
-            self.process.expect(r'\(gdb\)', timeout=10)
+            await asyncio.wait_for(self._read_records(results=0), timeout=10)
+            if not self.is_alive():
+                raise RuntimeError(f"{self.gdb_path} exited during startup")
             self.is_active = True
             
-            # Start command processing task
-            self._processing_task = asyncio.create_task(self._process_commands())
+            # Configure GDB so no command ever stops for the pager or a confirmation prompt
+            await asyncio.wait_for(self._exchange(SESSION_SETTINGS, len(SESSION_SETTINGS)), timeout=10)
             
-            logger.info(f"GDB session {self.session_id} started successfully")
-            return {
-                "status": "success",
-                "session_id": self.session_id,
-                "message": f"GDB session started with PID {self.process.pid}",
-                "gdb_path": self.gdb_path,
-                "working_dir": self.working_dir
-            }
+            logger.info("GDB session %s started successfully", self.session_id)
+            return self.started_result()
             
-        except Exception as e:
-            logger.error(f"Failed to start GDB session {self.session_id}: {e}")
+        except BaseException as e:
             self.is_active = False
+            
+            # The caller drops a failed session, so don't leave its GDB behind;
+            # this includes cancellation, e.g. POOL.close() stopping a refill
+            if self.is_alive():
+                self.process.kill()
+                await self.process.wait()
+            
+            if not isinstance(e, Exception):
+                raise
+            
+            if isinstance(e, asyncio.TimeoutError):
+                e = RuntimeError(f"{self.gdb_path} did not become ready in time")
+            logger.error("Failed to start GDB session %s: %s", self.session_id, e)
+            
             return {
                 "status": "error",
                 "session_id": self.session_id,
                 "error": str(e)
             }
     
-    async def _process_commands(self):
-        """Background task to process queued commands"""
-        while self.is_active and self.process and self.process.isalive():
-            try:
-                # Get command from queue with timeout
-                command, result_future = await asyncio.wait_for(
-                    self.command_queue.get(), timeout=1.0
-                )
-                
-                # Execute the command
-                result = await self._execute_command_internal(command)
-                result_future.set_result(result)
-                
-            except asyncio.TimeoutError:
+    def started_result(self) -> Dict[str, Any]:
+        """Result reported to the client once the session is ready"""
+        return {
+            "status": "success",
+            "session_id": self.session_id,
+            "message": f"GDB session started with PID {self.pid}",
+            "gdb_path": self.gdb_path,
+            "working_dir": self.working_dir
+        }
+    
+    async def _send(self, command: Union[str, List[str]], token: Optional[int] = None):
+        """Write one command, or a list of them, to GDB's stdin, each prefixed with the MI token.
+        
+        A single command is sent whole: the lines after the first are the body of a
+        CLI block (commands, define, python, while ...) and must reach GDB untouched.
+        """
+        commands = command if isinstance(command, list) else [command]
+        prefix = "" if token is None else str(token)
+        
+        self.process.stdin.write("".join(f"{prefix}{item}\n" for item in commands).encode())
+        await self.process.stdin.drain()
+    
+    async def _read_records(self, results: int = 1, token: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read parsed MI records up to the prompt following the `results`-th result record.
+        
+        MI emits exactly one record per line, so each line is parsed on its own
+        as it arrives. Only result records carrying `token` count; output left
+        over from a command that timed out earlier (an older token) is dropped. Callers bound
+        the wait with asyncio.wait_for.
+        """
+        records = []
+        
+        while True:
+            line = await self.process.stdout.readline()
+            
+            if not line:  # EOF
+                self.is_active = False
+                break
+            
+            if line.startswith(GDB_PROMPT):
+                if results <= 0:
+                    break
+                continue
+            
+            text = line.decode(errors="replace").rstrip("\r\n")
+            if not text:
                 continue
-            except Exception as e:
-                logger.error(f"Error processing command in session {self.session_id}: {e}")
-                if 'result_future' in locals():
-                    result_future.set_exception(e)
+            
+            record = _parse_record(text)
+            
+            if record["type"] == "result":
+                if record["token"] == token:
+                    results -= 1
+                elif record["token"] is not None and token is not None and record["token"] < token:
+                    # GDB runs commands in order, so everything so far was
+                    # output of the stale command, not of this one
+                    records.clear()
+                    continue
+                else:
+                    # Untokened "results" are inferior lines that merely start
+                    # with "^" (e.g. a compiler's "^~~~" marker), keep them as text
+                    record = {"type": "output", "message": None, "payload": text}
+            
+            records.append(record)
+            
+            # readline() doesn't suspend while output is already buffered, so a
+            # huge response would otherwise hold the loop until fully parsed
+            if len(records) % LINES_PER_YIELD == 0:
+                await asyncio.sleep(0)
+        
+        return records
+    
+    async def _exchange(self, command: Union[str, List[str]], results: int = 1) -> List[Dict[str, Any]]:
+        """Send a command under a fresh token and collect its records, see _read_records"""
+        self._token += 1
+        await self._send(command, self._token)
+        return await self._read_records(results, self._token)
     
-    async def _execute_command_internal(self, command: str) -> Dict[str, Any]:
+    async def _execute_command_internal(self, command: Union[str, List[str]]) -> Dict[str, Any]:
         """Execute a GDB command and return the result"""
-        if not self.is_active or not self.process or not self.process.isalive():
+        if not self.is_active or not self.is_alive():
             return {
                 "status": "error",
                 "error": "GDB session is not active"
             }
         
         try:
-            # Send command to GDB
-            self.process.sendline(command)
+            # Send command to GDB and wait for its result record; a list of commands
+            # shares one round-trip and waits for one result each
+            commands = command if isinstance(command, list) else [command]
+            records = await self._exchange(command, len(commands))
             
-            # Wait for response
-            output_lines = []
+            # Stream and inferior records carry the human-readable output, everything else
+            # (result, async, notify) is handed back already structured
+            echoes = {line + "\n" for command_text in commands for line in command_text.split("\n")}
+            buf = io.StringIO()
+            structured = []
             
-            while True:
-                try:
-                    index = self.process.expect([
-                        r'\(gdb\)',  # Normal prompt
-                        r'--Type <return> to continue.*--',  # Pager
-                        pexpect.TIMEOUT,
-                        pexpect.EOF
-                    ], timeout=5)
-                    
-                    if index == 0:  # Normal prompt
-                        output_lines.append(self.process.before)
-                        break
-                    elif index == 1:  # Pager
-                        self.process.send('\n')  # Continue paging
-                        output_lines.append(self.process.before)
-                    elif index == 2:  # Timeout
-                        output_lines.append(self.process.before)
-                        break
-                    else:  # EOF
-                        self.is_active = False
-                        break
-                        
-                except pexpect.TIMEOUT:
-                    output_lines.append(self.process.before)
-                    break
+            for record in records:
+                if record["type"] not in STREAM_RECORD_TYPES:
+                    structured.append(record)
+                elif record["type"] == "output":
+                    # Non-MI lines reach us without their line break
+                    buf.write(record["payload"])
+                    buf.write("\n")
+                elif record["payload"] and record["payload"] not in echoes:
+                    buf.write(record["payload"])
             
-            # Join all output
-            full_output = '\n'.join(filter(None, output_lines))
+            full_output = buf.getvalue().strip()
             
-            return {
+            # Keep the full output around so gdb_read_output can page through it
+            self.last_command = command
+            self.last_output = full_output
+            self.last_records = structured
+            
+            result = {
                 "status": "success",
                 "command": command,
-                "output": full_output.strip(),
+                "output": full_output,
+                "records": structured,
                 "session_id": self.session_id
             }
             
+            if len(full_output) > MAX_OUTPUT_CHARS:
+                result["output"] = (
+                    full_output[:MAX_OUTPUT_CHARS]
+                    + f"\n... [truncated {len(full_output) - MAX_OUTPUT_CHARS} characters]"
+                )
+                result["truncated"] = True
+                result["total_size"] = len(full_output)
+            
+            return result
+            
         except Exception as e:
-            logger.error(f"Error executing command '{command}' in session {self.session_id}: {e}")
+            logger.error("Error executing command '%s' in session %s: %s", command, self.session_id, e)
             return {
                 "status": "error",
                 "command": command,
@@ -159,53 +305,69 @@ class GDBSession:
                 "session_id": self.session_id
             }
     
-    async def execute_command(self, command: str) -> Dict[str, Any]:
-        """Queue a command for execution"""
+    def output_chunk(self, offset: int, size: int = MAX_OUTPUT_CHARS, records: bool = False) -> Dict[str, Any]:
+        """Slice of the last command's full output, or of its records as JSON, without running it again"""
+        size = min(size, MAX_OUTPUT_CHARS)
+        text = json.dumps(self.last_records) if records else self.last_output
+        output = text[offset:offset + size]
+        
+        return {
+            "status": "success",
+            "command": self.last_command,
+            "output": output,
+            "chunk_offset": offset,
+            "total_size": len(text),
+            "truncated": offset + len(output) < len(text),
+            "session_id": self.session_id
+        }
+    
+    async def execute_command(self, command: Union[str, List[str]]) -> Dict[str, Any]:
+        """Execute a command, one at a time per session"""
         if not self.is_active:
             return {
                 "status": "error",
                 "error": "GDB session is not active"
             }
         
-        # Create a future for the result
-        result_future = asyncio.Future()
-        
-        # Queue the command
-        await self.command_queue.put((command, result_future))
-        
-        # Wait for the result
-        try:
-            result = await asyncio.wait_for(result_future, timeout=30)
-            return result
-        except asyncio.TimeoutError:
+        # Reject early rather than let a runaway client pile up waiters
+        if self._pending >= MAX_PENDING_COMMANDS:
             return {
                 "status": "error",
-                "error": "Command execution timed out",
+                "error": f"Too many pending commands (limit {MAX_PENDING_COMMANDS})",
                 "command": command
             }
+        
+        # GDB is strictly serial, so commands take turns on the session lock
+        self._pending += 1
+        try:
+            async with self._lock:
+                try:
+                    return await asyncio.wait_for(self._execute_command_internal(command), timeout=30)
+                except asyncio.TimeoutError:
+                    return {
+                        "status": "error",
+                        "error": "Command execution timed out",
+                        "command": command
+                    }
+        finally:
+            self._pending -= 1
     
     async def terminate(self) -> Dict[str, Any]:
         """Terminate the GDB session"""
         try:
             self.is_active = False
             
-            if self._processing_task:
-                self._processing_task.cancel()
-                try:
-                    await self._processing_task
-                except asyncio.CancelledError:
-                    pass
-            
-            if self.process and self.process.isalive():
+            if self.is_alive():
                 # Try graceful shutdown first
                 try:
-                    self.process.sendline("quit")
-                    self.process.expect(pexpect.EOF, timeout=5)
+                    await self._send("-gdb-exit")
+                    await asyncio.wait_for(self.process.wait(), timeout=5)
                 except:
                     # Force kill if graceful shutdown fails
-                    self.process.terminate(force=True)
+                    self.process.kill()
+                    await self.process.wait()
             
-            logger.info(f"GDB session {self.session_id} terminated")
+            logger.info("GDB session %s terminated", self.session_id)
             return {
                 "status": "success",
                 "session_id": self.session_id,
@@ -213,41 +375,177 @@ class GDBSession:
             }
             
         except Exception as e:
-            logger.error(f"Error terminating GDB session {self.session_id}: {e}")
+            logger.error("Error terminating GDB session %s: %s", self.session_id, e)
             return {
                 "status": "error",
                 "session_id": self.session_id,
                 "error": str(e)
             }
 
+class GDBSessionPool:
+    """Keeps never-used GDB sessions warm so gdb_start can skip spawning GDB.
+    
+    Sessions are not recycled: GDB keeps too much client state (value history,
+    convenience variables, user commands, settings) to reset it reliably, so a
+    released session is always terminated.
+    """
+    
+    def __init__(self, gdb_path: str = "gdb", min_idle: int = 2):
+        self.gdb_path = gdb_path
+        self.min_idle = min_idle
+        self.idle: asyncio.Queue = asyncio.Queue()
+        self.starting = 0
+        self._refill_task: Optional[asyncio.Task] = None
+    
+    def _is_default(self, gdb_path: str, working_dir: Optional[str]) -> bool:
+        """Pooled sessions only stand in for the default gdb in the server's cwd"""
+        return gdb_path == self.gdb_path and working_dir in (None, _DEFAULT_CWD)
+    
+    def _schedule_refill(self):
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill())
+    
+    async def _refill(self):
+        """Background task topping the pool up to min_idle sessions"""
+        while self.idle.qsize() < self.min_idle and _gdb_process_count() < MAX_SESSIONS:
+            session = GDBSession(_new_session_id(), self.gdb_path)
+            self.starting += 1
+            try:
+                result = await session.start()
+            finally:
+                self.starting -= 1
+            
+            if result["status"] != "success":
+                logger.warning("Could not pre-start a pooled GDB session: %s", result["error"])
+                return
+            
+            self.idle.put_nowait(session)
+    
+    async def acquire(self, session_id: str, gdb_path: str = "gdb", working_dir: Optional[str] = None) -> Tuple[GDBSession, Dict[str, Any]]:
+        """Hand out a ready session, starting a new one if none is pooled"""
+        if self._is_default(gdb_path, working_dir):
+            self._schedule_refill()
+            
+            while not self.idle.empty():
+                session = self.idle.get_nowait()
+                
+                if session.is_active and session.is_alive():
+                    session.session_id = session_id
+                    logger.info("GDB session %s taken from the pool", session_id)
+                    return session, session.started_result()
+                
+                await session.terminate()
+        
+        # Make room by dropping warm sessions rather than going over MAX_SESSIONS
+        while _gdb_process_count() > MAX_SESSIONS and not self.idle.empty():
+            await self.idle.get_nowait().terminate()
+        
+        session = GDBSession(session_id, gdb_path, working_dir)
+        return session, await session.start()
+    
+    async def close(self):
+        """Stop refilling and terminate every idle session"""
+        if self._refill_task:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+        
+        idle_sessions = []
+        while not self.idle.empty():
+            idle_sessions.append(self.idle.get_nowait())
+        
+        await asyncio.gather(*(session.terminate() for session in idle_sessions))
+
 # Global sessions dictionary to maintain state across tool calls
 SESSIONS: Dict[str, GDBSession] = {}
 
+# Warm sessions handed out by gdb_start
+POOL = GDBSessionPool()
+
+# gdb_start calls holding a MAX_SESSIONS slot while their session starts
+_reserved_sessions = 0
+
+def _gdb_process_count() -> int:
+    """Count GDB processes in use, reserved, pooled or being pre-started"""
+    return len(SESSIONS) + _reserved_sessions + POOL.idle.qsize() + POOL.starting
+
+class SessionNotFoundError(KeyError):
+    """Raised when a tool is called with an unknown session id"""
+
+def _get_session(session_id: str) -> GDBSession:
+    """Look up a session, raising SessionNotFoundError if it does not exist"""
+    session = SESSIONS.get(session_id)
+    if session is None:
+        raise SessionNotFoundError(session_id)
+    return session
+
+class MICommandError(Exception):
+    """Raised when an MI command does not complete with ^done"""
+
+async def _run_mi(session: GDBSession, command: Union[str, List[str]]) -> List[Dict[str, Any]]:
+    """Run an MI command, or a list of them, and return each ^done payload in order"""
+    result = await session.execute_command(command)
+    if result["status"] != "success":
+        raise MICommandError(result["error"])
+    
+    payloads = []
+    for record in result["records"]:
+        if record["type"] != "result":
+            continue
+        if record["message"] != "done":
+            raise MICommandError((record["payload"] or {}).get("msg", f"Unexpected ^{record['message']}"))
+        payloads.append(record["payload"] or {})
+    
+    if len(payloads) < (len(command) if isinstance(command, list) else 1):
+        raise MICommandError("GDB exited before answering")
+    
+    return payloads
+
+def _session_tool(func):
+    """Report unknown session ids and failed MI commands from a tool as an error result"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except SessionNotFoundError as e:
+            return {"status": "error", "error": f"Session {e.args[0]} not found"}
+        except MICommandError as e:
+            return {"status": "error", "error": str(e)}
+    return wrapper
+
 # Create FastMCP server instance
 mcp = FastMCP("SungDB MCP Server")
 
 # Session management tools
 async def gdb_start(gdb_path: str = "gdb", working_dir: Optional[str] = None) -> Dict[str, Any]:
     """Start a new GDB session"""
-    session_id = str(uuid.uuid4())
-    session = GDBSession(session_id, gdb_path, working_dir)
+    global _reserved_sessions
     
-    result = await session.start()
+    # Reserve the slot before awaiting so concurrent calls can't all pass the check
+    if len(SESSIONS) + _reserved_sessions >= MAX_SESSIONS:
+        return {
+            "status": "error",
+            "error": f"Too many active sessions (limit {MAX_SESSIONS})"
+        }
+    
+    _reserved_sessions += 1
+    try:
+        session_id = _new_session_id()
+        session, result = await POOL.acquire(session_id, gdb_path, working_dir)
+    finally:
+        _reserved_sessions -= 1
     
     if result["status"] == "success":
         SESSIONS[session_id] = session
     
     return result
 
+@_session_tool
 async def gdb_terminate(session_id: str) -> Dict[str, Any]:
     """Terminate a GDB session"""
-    if session_id not in SESSIONS:
-        return {
-            "status": "error",
-            "error": f"Session {session_id} not found"
-        }
-    
-    session = SESSIONS[session_id]
+    session = _get_session(session_id)
     result = await session.terminate()
     
     if result["status"] == "success":
@@ -265,7 +563,7 @@ async def gdb_list_sessions(dummy: str = "") -> Dict[str, Any]:
             "gdb_path": session.gdb_path,
             "working_dir": session.working_dir,
             "is_active": session.is_active,
-            "pid": session.process.pid if session.process and session.process.isalive() else None
+            "pid": session.pid
         })
     
     return {
@@ -275,92 +573,66 @@ async def gdb_list_sessions(dummy: str = "") -> Dict[str, Any]:
     }
 
 # Program loading and attachment
+@_session_tool
 async def gdb_load(session_id: str, program: str, arguments: Optional[List[str]] = None) -> Dict[str, Any]:
     """Load a program into GDB"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
+    session = _get_session(session_id)
     
-    session = SESSIONS[session_id]
-    
-    # Load the program
-    load_result = await session.execute_command(f"file {program}")
+    commands = [f"file {program}"]
     
     if arguments:
         args_str = " ".join(arguments)
-        args_result = await session.execute_command(f"set args {args_str}")
-        load_result["arguments_result"] = args_result
+        commands.append(f"set args {args_str}")
     
-    return load_result
+    # Load the program and set its arguments in one round-trip
+    return await session.execute_command(commands)
 
+@_session_tool
 async def gdb_attach(session_id: str, pid: int) -> Dict[str, Any]:
     """Attach to a running process"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
-    
-    session = SESSIONS[session_id]
+    session = _get_session(session_id)
     return await session.execute_command(f"attach {pid}")
 
+@_session_tool
 async def gdb_load_core(session_id: str, program: str, core_path: str) -> Dict[str, Any]:
     """Load a core dump file"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
-    
-    session = SESSIONS[session_id]
+    session = _get_session(session_id)
     
-    # Load program first
-    load_result = await session.execute_command(f"file {program}")
-    
-    # Load core dump
-    core_result = await session.execute_command(f"core {core_path}")
-    
-    return {
-        "status": "success",
-        "file_result": load_result,
-        "core_result": core_result
-    }
+    # Load program and core dump in one round-trip
+    return await session.execute_command([f"file {program}", f"core {core_path}"])
 
 # Execution control
+@_session_tool
 async def gdb_continue(session_id: str) -> Dict[str, Any]:
     """Continue program execution"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
-    
-    session = SESSIONS[session_id]
+    session = _get_session(session_id)
     return await session.execute_command("continue")
 
+@_session_tool
 async def gdb_step(session_id: str, instructions: bool = False) -> Dict[str, Any]:
     """Step program execution"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
-    
-    session = SESSIONS[session_id]
+    session = _get_session(session_id)
     command = "stepi" if instructions else "step"
     return await session.execute_command(command)
 
+@_session_tool
 async def gdb_next(session_id: str, instructions: bool = False) -> Dict[str, Any]:
     """Step over function calls"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
-    
-    session = SESSIONS[session_id]
+    session = _get_session(session_id)
     command = "nexti" if instructions else "next"
     return await session.execute_command(command)
 
+@_session_tool
 async def gdb_finish(session_id: str) -> Dict[str, Any]:
     """Execute until the current function returns"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
-    
-    session = SESSIONS[session_id]
+    session = _get_session(session_id)
     return await session.execute_command("finish")
 
 # Breakpoints
+@_session_tool
 async def gdb_set_breakpoint(session_id: str, location: str, condition: Optional[str] = None) -> Dict[str, Any]:
     """Set a breakpoint"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
-    
-    session = SESSIONS[session_id]
+    session = _get_session(session_id)
     
     if condition:
         command = f"break {location} if {condition}"
@@ -370,37 +642,68 @@ async def gdb_set_breakpoint(session_id: str, location: str, condition: Optional
     return await session.execute_command(command)
 
 # Information and debugging
+@_session_tool
 async def gdb_backtrace(session_id: str, full: bool = False, limit: Optional[int] = None) -> Dict[str, Any]:
-    """Show call stack"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
-    
-    session = SESSIONS[session_id]
+    """Show call stack as structured frames, with locals when full is set"""
+    session = _get_session(session_id)
     
-    if full:
-        command = "bt full"
+    if not limit:
+        frame_range = ""
+    elif limit > 0:
+        frame_range = f" 0 {limit - 1}"
     else:
-        command = "bt"
+        # Like "bt -N", a negative limit shows the outermost N frames
+        depth = int((await _run_mi(session, "-stack-info-depth"))[0]["depth"])
+        frame_range = f" {max(depth + limit, 0)} {depth - 1}"
+    
+    commands = [
+        f"-stack-list-frames{frame_range}",
+        f"-stack-list-arguments 1{frame_range}"
+    ]
+    if full:
+        # Listing locals per frame moves the selected frame, so remember it
+        commands.append("-stack-info-frame")
+    
+    payloads = await _run_mi(session, commands)
+    frames = payloads[0].get("stack", [])
+    args_by_level = {
+        frame["level"]: frame.get("args", [])
+        for frame in payloads[1].get("stack-args", [])
+    }
     
-    if limit:
-        command += f" {limit}"
+    for frame in frames:
+        frame["args"] = args_by_level.get(frame["level"], [])
     
-    return await session.execute_command(command)
+    if full and frames:
+        selected_level = payloads[2]["frame"]["level"]
+        
+        # --frame alone is rejected without --thread, so select each frame instead
+        commands = []
+        for frame in frames:
+            commands.append(f"-stack-select-frame {frame['level']}")
+            commands.append("-stack-list-locals 1")
+        commands.append(f"-stack-select-frame {selected_level}")
+        
+        payloads = await _run_mi(session, commands)
+        for frame, payload in zip(frames, payloads[1::2]):
+            frame["locals"] = payload.get("locals", [])
+    
+    return {
+        "status": "success",
+        "session_id": session_id,
+        "frames": frames
+    }
 
+@_session_tool
 async def gdb_print(session_id: str, expression: str) -> Dict[str, Any]:
     """Print value of expression"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
-    
-    session = SESSIONS[session_id]
+    session = _get_session(session_id)
     return await session.execute_command(f"print {expression}")
 
+@_session_tool
 async def gdb_examine(session_id: str, expression: str, count: Optional[int] = None, format: Optional[str] = None) -> Dict[str, Any]:
     """Examine memory"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
-    
-    session = SESSIONS[session_id]
+    session = _get_session(session_id)
     
     command = "x"
     if count and format:
@@ -414,80 +717,187 @@ async def gdb_examine(session_id: str, expression: str, count: Optional[int] = N
     
     return await session.execute_command(command)
 
+@_session_tool
 async def gdb_info_registers(session_id: str, register: Optional[str] = None) -> Dict[str, Any]:
-    """Display registers"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
-    
-    session = SESSIONS[session_id]
+    """Display registers as structured name/value pairs"""
+    session = _get_session(session_id)
     
     if register:
-        command = f"info registers {register}"
+        names = (await _run_mi(session, "-data-list-register-names"))[0].get("register-names", [])
+        name = register.lstrip("$")
+        
+        if name not in names:
+            # Aliases such as pc/sp are not in the register list, let the CLI resolve them
+            return await session.execute_command(f"info registers {register}")
+        
+        values = (await _run_mi(session, f"-data-list-register-values x {names.index(name)}"))[0]
     else:
-        command = "info registers"
+        payloads = await _run_mi(session, ["-data-list-register-names", "-data-list-register-values x"])
+        names = payloads[0].get("register-names", [])
+        values = payloads[1]
+    
+    registers = []
+    for value in values.get("register-values", []):
+        number = int(value["number"])
+        registers.append({
+            "number": number,
+            "name": names[number] if number < len(names) else "",
+            "value": value["value"]
+        })
     
-    return await session.execute_command(command)
+    return {
+        "status": "success",
+        "session_id": session_id,
+        "registers": registers
+    }
 
 # Generic command execution
+@_session_tool
 async def gdb_command(session_id: str, command: str) -> Dict[str, Any]:
-    """Execute a GDB command"""
-    if session_id not in SESSIONS:
-        return {"status": "error", "error": f"Session {session_id} not found"}
+    """Execute a GDB command
     
-    session = SESSIONS[session_id]
-    return await session.execute_command(command)
-
-# Register all tools
-mcp.add_tool(Tool.from_function(gdb_start, name="gdb_start", description="Start a new GDB session"))
-mcp.add_tool(Tool.from_function(gdb_terminate, name="gdb_terminate", description="Terminate a GDB session"))
-mcp.add_tool(Tool.from_function(gdb_list_sessions, name="gdb_list_sessions", description="List all active GDB sessions"))
-
-mcp.add_tool(Tool.from_function(gdb_load, name="gdb_load", description="Load a program into GDB"))
-mcp.add_tool(Tool.from_function(gdb_attach, name="gdb_attach", description="Attach to a running process"))
-mcp.add_tool(Tool.from_function(gdb_load_core, name="gdb_load_core", description="Load a core dump file"))
-
-mcp.add_tool(Tool.from_function(gdb_continue, name="gdb_continue", description="Continue program execution"))
-mcp.add_tool(Tool.from_function(gdb_step, name="gdb_step", description="Step program execution"))
-mcp.add_tool(Tool.from_function(gdb_next, name="gdb_next", description="Step over function calls"))
-mcp.add_tool(Tool.from_function(gdb_finish, name="gdb_finish", description="Execute until the current function returns"))
+    Output over MAX_OUTPUT_CHARS is truncated, and so are MI records whose
+    JSON is over it; gdb_read_output pages through either in full.
+    """
+    session = _get_session(session_id)
+    result = await session.execute_command(command)
+    
+    if result["status"] == "success":
+        records_size = len(json.dumps(result["records"]))
+        if records_size > MAX_OUTPUT_CHARS:
+            # Keep the shape of each record but leave the payloads to gdb_read_output
+            result["records"] = [
+                {key: value for key, value in record.items() if key != "payload"}
+                for record in result["records"]
+            ]
+            result["records_truncated"] = True
+            result["records_size"] = records_size
+    
+    return result
 
-mcp.add_tool(Tool.from_function(gdb_set_breakpoint, name="gdb_set_breakpoint", description="Set a breakpoint"))
+@_session_tool
+async def gdb_read_output(session_id: str, chunk_offset: int = 0, chunk_size: int = MAX_OUTPUT_CHARS, records: bool = False) -> Dict[str, Any]:
+    """Page through the last command's full output without running it again
+    
+    With records set, pages through the command's MI records as JSON instead.
+    """
+    session = _get_session(session_id)
+    
+    if chunk_offset < 0:
+        return {"status": "error", "error": "chunk_offset must not be negative"}
+    if chunk_size <= 0:
+        return {"status": "error", "error": "chunk_size must be positive"}
+    if session.last_command is None:
+        return {"status": "error", "error": "No command has been run in this session"}
+    
+    return session.output_chunk(chunk_offset, chunk_size, records)
 
-mcp.add_tool(Tool.from_function(gdb_backtrace, name="gdb_backtrace", description="Show call stack"))
-mcp.add_tool(Tool.from_function(gdb_print, name="gdb_print", description="Print value of expression"))
-mcp.add_tool(Tool.from_function(gdb_examine, name="gdb_examine", description="Examine memory"))
-mcp.add_tool(Tool.from_function(gdb_info_registers, name="gdb_info_registers", description="Display registers"))
+# All tools, registered under their function names
+_TOOLS = [
+    (gdb_start, "Start a new GDB session"),
+    (gdb_terminate, "Terminate a GDB session"),
+    (gdb_list_sessions, "List all active GDB sessions"),
+    
+    (gdb_load, "Load a program into GDB"),
+    (gdb_attach, "Attach to a running process"),
+    (gdb_load_core, "Load a core dump file"),
+    
+    (gdb_continue, "Continue program execution"),
+    (gdb_step, "Step program execution"),
+    (gdb_next, "Step over function calls"),
+    (gdb_finish, "Execute until the current function returns"),
+    
+    (gdb_set_breakpoint, "Set a breakpoint"),
+    
+    (gdb_backtrace, "Show call stack as structured frames (with locals when full=True)"),
+    (gdb_print, "Print value of expression"),
+    (gdb_examine, "Examine memory"),
+    (gdb_info_registers, "Display registers as structured name/value pairs"),
+    
+    (gdb_command, "Execute a GDB command"),
+    (gdb_read_output, "Page through the last command's full output (or its MI records with records=True)"),
+]
 
-mcp.add_tool(Tool.from_function(gdb_command, name="gdb_command", description="Execute a GDB command"))
+for tool_function, description in _TOOLS:
+    mcp.add_tool(Tool.from_function(tool_function, name=tool_function.__name__, description=description))
 
 async def cleanup():
     """Clean up all sessions"""
     logger.info("Cleaning up all GDB sessions...")
-    for session_id in list(SESSIONS.keys()):
+    sessions = list(SESSIONS.items())
+    SESSIONS.clear()
+    
+    # Sessions shut down concurrently, so a stuck GDB only costs its own timeout once
+    results = await asyncio.gather(
+        *(session.terminate() for _, session in sessions),
+        return_exceptions=True
+    )
+    
+    for (session_id, _), result in zip(sessions, results):
+        if isinstance(result, Exception):
+            logger.error("Error terminating session %s: %s", session_id, result)
+    
+    await POOL.close()
+
+# Cleanup started by the first SIGINT/SIGTERM, it ends by exiting the process
+_shutdown_task: Optional[asyncio.Task] = None
+
+async def _shutdown():
+    """Clean up within SHUTDOWN_TIMEOUT, then exit without waiting for the server"""
+    try:
+        await asyncio.wait_for(cleanup(), timeout=SHUTDOWN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.error("Cleanup did not finish within %s seconds", SHUTDOWN_TIMEOUT)
+    except Exception as e:
+        logger.error("Error during cleanup: %s", e)
+    
+    logger.info("SungDB MCP Server shutdown complete")
+    logging.shutdown()
+    
+    # The stdio transport reads stdin in a worker thread that cancellation can't
+    # interrupt, so returning through asyncio.run would block until the next line
+    os._exit(0)
+
+def _request_shutdown(signum: int, server: asyncio.Task):
+    """Signal handler: stop serving and clean up on this same loop, then exit"""
+    global _shutdown_task
+    logger.info("Received signal %s, shutting down gracefully...", signum)
+    
+    if _shutdown_task is None:
+        server.cancel()
+        _shutdown_task = asyncio.create_task(_shutdown())
+
+def _install_handlers(loop: asyncio.AbstractEventLoop, server: asyncio.Task):
+    """Route SIGINT/SIGTERM through the running loop"""
+    for signum in (signal.SIGINT, signal.SIGTERM):
         try:
-            await gdb_terminate(session_id)
-        except Exception as e:
-            logger.error(f"Error terminating session {session_id}: {e}")
+            loop.add_signal_handler(signum, _request_shutdown, signum, server)
+        except NotImplementedError:
+            # Windows event loops have no signal handlers; Ctrl+C raises KeyboardInterrupt
+            pass
+
+async def _serve(**transport_kwargs):
+    """Run the MCP server, then terminate all sessions on the server's own loop"""
+    server = asyncio.create_task(mcp.run_async(**transport_kwargs))
+    _install_handlers(asyncio.get_running_loop(), server)
+    
+    try:
+        await server
+    except asyncio.CancelledError:
+        pass
+    finally:
+        if _shutdown_task is None:
+            await cleanup()
+        else:
+            await _shutdown_task
 
 def main():
     """Main entry point"""
     logger.info("Starting SungDB MCP Server...")
     logger.info("Press Ctrl+C to stop the server")
     
-    # Set up signal handlers
-    import signal
     import sys
     
-    def signal_handler(signum, frame):
-        logger.info(f"Received signal {signum}, shutting down gracefully...")
-        # Force immediate exit for STDIO mode
-        logger.info("SungDB MCP Server shutdown complete")
-        sys.exit(0)
-    
-    # Install signal handlers
-    signal.signal(signal.SIGINT, signal_handler) 
-    signal.signal(signal.SIGTERM, signal_handler)
-    
     try:
         # Use STDIO mode (default) for MCP client compatibility
         logger.info("Starting in STDIO mode for MCP client compatibility")
@@ -496,20 +906,19 @@ def main():
         # Check for HTTP mode flag
         if len(sys.argv) > 1 and sys.argv[1] == '--http':
             logger.info("Running in HTTP mode on http://localhost:8000/mcp")
-            mcp.run(transport="http", host="localhost", port=8000)
+            asyncio.run(_serve(transport="http", host="localhost", port=8000))
         else:
             # Default STDIO mode
-            mcp.run()
+            asyncio.run(_serve())
             
     except KeyboardInterrupt:
         logger.info("Received KeyboardInterrupt, shutting down...")
     except Exception as e:
-        logger.error(f"Server error: {e}")
+        logger.error("Server error: %s", e)
         import traceback
         traceback.print_exc()
     finally:
         logger.info("SungDB MCP Server shutdown complete")
 
-
 if __name__ == "__main__":
     main()